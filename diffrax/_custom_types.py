@@ -128,13 +128,13 @@ def levy_tree_transpose(
 
     An `AbstractBrownianIncrement` of `PyTree`s.
     """
-    inner_tree = jtu.tree_leaves(
-        tree, is_leaf=lambda x: isinstance(x, AbstractBrownianIncrement)
-    )[0]
-    inner_tree_shape = jtu.tree_structure(inner_tree)
+    outer_treedef = jtu.tree_structure(tree_shape)
+    # Use the known outer structure to find an `AbstractBrownianIncrement`, rather than
+    # searching for one with an `is_leaf` callback at every node.
+    inner_tree = outer_treedef.flatten_up_to(tree)[0]
     return jtu.tree_transpose(
-        outer_treedef=jtu.tree_structure(tree_shape),
-        inner_treedef=inner_tree_shape,
+        outer_treedef=outer_treedef,
+        inner_treedef=jtu.tree_structure(inner_tree),
         pytree_to_transpose=tree,
     )
 
@@ -2,6 +2,7 @@ from collections.abc import Callable
 from typing import cast, Optional, TYPE_CHECKING
 
 import jax
+import jax.lax as lax
 import jax.numpy as jnp
 import jax.tree_util as jtu
 import numpy as np
@@ -13,6 +14,7 @@ else:
     from equinox import AbstractVar
 from equinox.internal import ω
 from jaxtyping import Array, ArrayLike, PyTree, Shaped
+from lineax.internal import complex_to_real_dtype
 
 from ._custom_types import RealScalarLike, Y
 from ._misc import linear_rescale
@@ -109,8 +111,15 @@ class FourthOrderPolynomialInterpolation(AbstractLocalInterpolation):
         k: PyTree[Shaped[Array, "order ?*y"], "Y"],
     ):
         def _calculate(_y0, _y1, _k):
+            # Cast to the precision of the stages, so that e.g. float32 stages are not
+            # promoted to float64 by the (float64) NumPy coefficients.
+            c_mid = jnp.asarray(
+                self.c_mid, dtype=complex_to_real_dtype(jnp.result_type(_k))
+            )
             with jax.numpy_dtype_promotion("standard"):
-                _ymid = _y0 + jnp.tensordot(self.c_mid, _k, axes=1)
+                _ymid = _y0 + jnp.einsum(
+                    "i,i...->...", c_mid, _k, precision=lax.Precision.HIGHEST
+                )
             _f0 = _k[0]
             _f1 = _k[-1]
             # TODO: rewrite as matrix-vector product?
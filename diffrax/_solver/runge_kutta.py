@@ -68,6 +68,11 @@ class ButcherTableau:
     fsal: bool = field(init=False)
     implicit: bool = field(init=False)
     num_stages: int = field(init=False)
+    # Square versions of the above triangular tableaus, zero-padded. Used so that the
+    # loop over stages can index them with a (traced) stage counter.
+    a_lower_square: np.ndarray = field(init=False)
+    a_predictor_square: Optional[np.ndarray] = field(init=False)
+    c_full: np.ndarray = field(init=False)
 
     # Example!
     #
@@ -167,6 +172,26 @@ class ButcherTableau:
         object.__setattr__(self, "implicit", self.a_diagonal is not None)
         object.__setattr__(self, "num_stages", len(self.b_sol))
 
+        def _square(_a):
+            _a_square = np.zeros(
+                (self.num_stages, self.num_stages), dtype=np.result_type(*_a)
+            )
+            for i, _a_i in enumerate(_a):
+                _a_square[i + 1, : i + 1] = _a_i
+            return _a_square
+
+        c_full = np.zeros(self.num_stages, dtype=self.c.dtype)
+        if self.c1 is not None:
+            c_full[0] = self.c1
+        c_full[1:] = self.c
+        object.__setattr__(self, "a_lower_square", _square(self.a_lower))
+        object.__setattr__(
+            self,
+            "a_predictor_square",
+            None if self.a_predictor is None else _square(self.a_predictor),
+        )
+        object.__setattr__(self, "c_full", c_full)
+
 
 ButcherTableau.__init__.__doc__ = """**Arguments:**
 
@@ -777,9 +802,10 @@ class AbstractRungeKutta(AbstractAdaptiveSolver[_SolverState]):
                 ks = ty_map(embed_k0, k0, ks)
 
         #
-        # Transform our tableaus into full square tableaus. (Rather than just the
-        # triangular ones in which they're stored.) This is needed so that we can do
-        # matvecs against them, which can't be of variable length.
+        # Use the full square versions of our tableaus. (Rather than just the
+        # triangular ones in which they're specified; the padding is done once, when the
+        # `ButcherTableau` is created.) This is needed so that we can do matvecs against
+        # them, which can't be of variable length.
         # (We could maybe implement a variable-length matvec by using a while loop --
         # not clear that that would necessarily get good performance though. Not
         # benchmarked.)
@@ -792,19 +818,10 @@ class AbstractRungeKutta(AbstractAdaptiveSolver[_SolverState]):
             tableau_dtype = jnp.result_type(*y0_leaves)
 
         def embed_a_lower(tab):
-            tab_a_lower = np.zeros(
-                (num_stages, num_stages), dtype=np.result_type(*tab.a_lower)
-            )
-            for i, a_lower_i in enumerate(tab.a_lower):
-                tab_a_lower[i + 1, : i + 1] = a_lower_i
-            return jnp.asarray(tab_a_lower, dtype=tableau_dtype)
+            return jnp.asarray(tab.a_lower_square, dtype=tableau_dtype)
 
         def embed_c(tab):
-            tab_c = np.zeros(num_stages, dtype=tab.c.dtype)
-            if tab.c1 is not None:
-                tab_c[0] = tab.c1
-            tab_c[1:] = tab.c
-            return jnp.asarray(tab_c, dtype=jnp.result_type(t0, t1))
+            return jnp.asarray(tab.c_full, dtype=jnp.result_type(t0, t1))
 
         tableaus_a_lower = t_map(embed_a_lower, tableaus)
         tableaus_c = t_map(embed_c, tableaus)
@@ -813,13 +830,9 @@ class AbstractRungeKutta(AbstractAdaptiveSolver[_SolverState]):
             implicit_diagonal = jnp.asarray(
                 implicit_tableau.a_diagonal, dtype=tableau_dtype
             )
-            implicit_predictor = np.zeros(
-                (num_stages, num_stages),
-                dtype=np.result_type(*implicit_tableau.a_predictor),
+            implicit_predictor = jnp.asarray(
+                implicit_tableau.a_predictor_square, dtype=tableau_dtype
             )
-            for i, a_predictor_i in enumerate(implicit_tableau.a_predictor):  # pyright: ignore
-                implicit_predictor[i + 1, : i + 1] = a_predictor_i
-            implicit_predictor = jnp.asarray(implicit_predictor, dtype=tableau_dtype)
             implicit_c = get_implicit(tableaus_c)
 
         if implicit_term is None:
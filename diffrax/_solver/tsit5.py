@@ -3,14 +3,16 @@ from typing import ClassVar, Optional
 
 import brainunit as u
 import jax
+import jax.lax as lax
+import jax.numpy as jnp
 import numpy as np
+import numpy.polynomial.polynomial as npp
 from jaxtyping import Array, PyTree, Shaped
+from lineax.internal import complex_to_real_dtype
 
-from .base import vector_tree_dot
 from .runge_kutta import AbstractERK, ButcherTableau
 from .._custom_types import RealScalarLike, Y
 from .._local_interpolation import AbstractLocalInterpolation
-from .._misc import linear_rescale
 
 _tsit5_tableau = ButcherTableau(
     a_lower=(
@@ -102,6 +104,41 @@ _tsit5_tableau = ButcherTableau(
 )
 
 
+def _expand(scale, roots, quadratic=(1.0,)):
+    # `scale * prod(t - root for root in roots) * quadratic(t)`, with `quadratic` in
+    # increasing order of powers, as the coefficients of t^0, ..., t^4.
+    coeffs = scale * npp.polymul(npp.polyfromroots(roots), quadratic)
+    return np.pad(coeffs, (0, 5 - len(coeffs)))
+
+
+# The interpolating polynomials b1, ..., b7 of Tsitouras' paper, in their factored
+# forms, expanded into the monomial basis. Row i holds the coefficients of t^0, ..., t^4
+# for b_{i+1}.
+_tsit5_interp_coeffs = np.stack(
+    [
+        _expand(
+            -1.0530884977290216,
+            [0, 1.3299890189751412],
+            [0.7139816917074209, -1.4364028541716351, 1],
+        ),
+        _expand(0.1017, [0, 0], [1.2949852507374631, -2.1966568338249754, 1]),
+        _expand(
+            2.490627285651252793,
+            [0, 0],
+            [1.57803468208092486, -2.38535645472061657, 1],
+        ),
+        _expand(
+            -16.54810288924490272, [0, 0, 1.21712927295533244, 0.61620406037800089]
+        ),
+        _expand(
+            47.37952196281928122, [0, 0, 1.203071208372362603, 0.658047292653547382]
+        ),
+        _expand(-34.87065786149660974, [0, 0, 1.2, 0.666666666666666667]),
+        _expand(2.5, [0, 0, 1, 0.6]),
+    ]
+)
+
+
 class _Tsit5Interpolation(AbstractLocalInterpolation):
     t0: RealScalarLike
     t1: RealScalarLike
@@ -122,46 +159,58 @@ class _Tsit5Interpolation(AbstractLocalInterpolation):
         left: bool = True
     ) -> Y:
         del left
+        # As `linear_rescale`, but sharing a single reciprocal between both endpoints of
+        # an interval query.
+        cond = self.t0 == self.t1
+        dt = u.math.where(cond, u.math.ones_like(self.t1), self.t1 - self.t0)
+        inv_dt = 1 / dt
+
+        def _rescale(_t):
+            return u.math.where(cond, u.math.zeros_like(_t), _t - self.t0) * inv_dt
+
+        t0 = _rescale(t0)
         if t1 is not None:
-            return self.evaluate(t1) - self.evaluate(t0)
-
-        t = linear_rescale(self.t0, t0, self.t1)
-
-        # TODO: write as a matrix-multiply or vmap'd polyval
-        b1 = (
-            -1.0530884977290216
-            * t
-            * (t - 1.3299890189751412)
-            * (t ** 2 - 1.4364028541716351 * t + 0.7139816917074209)
-        )
-        b2 = 0.1017 * t ** 2 * (t ** 2 - 2.1966568338249754 * t + 1.2949852507374631)
-        b3 = (
-            2.490627285651252793
-            * t ** 2
-            * (t ** 2 - 2.38535645472061657 * t + 1.57803468208092486)
-        )
-        b4 = (
-            -16.54810288924490272
-            * (t - 1.21712927295533244)
-            * (t - 0.61620406037800089)
-            * t ** 2
-        )
-        b5 = (
-            47.37952196281928122
-            * (t - 1.203071208372362603)
-            * (t - 0.658047292653547382)
-            * t ** 2
-        )
-        b6 = -34.87065786149660974 * (t - 1.2) * (t - 0.666666666666666667) * t ** 2
-        b7 = 2.5 * (t - 1) * (t - 0.6) * t ** 2
+            t1 = _rescale(t1)
+        # Work in a single real dtype wide enough for both `t` and `y0`, so that the
+        # contraction below never mixes precisions (which would have XLA insert casts
+        # around every power of `t`).
+        y0_leaves = jax.tree.leaves(self.y0, is_leaf=u.math.is_quantity)
         with jax.numpy_dtype_promotion("standard"):
-            return jax.tree.map(
-                u.math.add,
-                self.y0,
-                vector_tree_dot(u.math.stack([b1, b2, b3, b4, b5, b6, b7]), self.k),
-                is_leaf=u.math.is_quantity
+            dtype = complex_to_real_dtype(u.math.result_type(t0, *y0_leaves))
+
+        def _powers(_t):
+            _t = _t.astype(dtype)
+            _t2 = _t * _t
+            return jnp.stack([jnp.ones_like(_t), _t, _t2, _t2 * _t, _t2 * _t2])
+
+        if t1 is None:
+            t_powers = _powers(t0)
+        else:
+            # `y0` cancels in `evaluate(t1) - evaluate(t0)`, so difference the powers of
+            # `t` instead and perform just a single contraction.
+            t_powers = _powers(t1) - _powers(t0)
+        coeffs = jnp.asarray(_tsit5_interp_coeffs, dtype=dtype)
+
+        # Contract the coefficients, the powers of `t`, and the stages in one go, so
+        # that XLA can fuse it all into a single kernel.
+        def _eval(_k):
+            # Only pay for brainunit's dispatch when there are actually units involved.
+            einsum = u.math.einsum if u.math.is_quantity(_k) else jnp.einsum
+            return einsum(
+                "ij,j,i...->...", coeffs, t_powers, _k, precision=lax.Precision.HIGHEST
             )
 
+        with jax.numpy_dtype_promotion("standard"):
+            if t1 is None:
+                return jax.tree.map(
+                    lambda _y0, _k: _y0 + _eval(_k),
+                    self.y0,
+                    self.k,
+                    is_leaf=u.math.is_quantity,
+                )
+            else:
+                return jax.tree.map(_eval, self.k, is_leaf=u.math.is_quantity)
+
 
 class Tsit5(AbstractERK):
     r"""Tsitouras' 5/4 method.
@@ -1,8 +1,8 @@
 import functools as ft
-import operator
 from typing import cast
 
 import diffrax
+import equinox as eqx
 import jax
 import jax.numpy as jnp
 import jax.random as jr
@@ -13,6 +13,67 @@ from jaxtyping import Array
 from .helpers import all_ode_solvers, all_split_solvers, implicit_tol, tree_allclose
 
 
+# Shared across all tests, so that JAX's compilation cache is hit whenever the same kind
+# of path is evaluated at the same shapes, rather than retracing in every test.
+@eqx.filter_jit
+def _vmap_evaluate(path, ts):
+    return jax.vmap(path.evaluate)(ts)
+
+
+@eqx.filter_jit
+def _vmap_evaluate_left_right(path, ts):
+    # Both one-sided limits in a single dispatch. (Each limit still does its own
+    # interval lookup, as they search with different sides.)
+    def _evaluate(t):
+        return path.evaluate(t, left=True), path.evaluate(t, left=False)
+
+    return jax.vmap(_evaluate)(ts)
+
+
+@eqx.filter_jit
+def _vmap_derivative(path, ts):
+    return jax.vmap(path.derivative)(ts)
+
+
+def _evaluate_merged(interp, ts):
+    left, right = _vmap_evaluate_left_right(interp, ts)
+
+    def _merge(lef, rig):
+        # Must be identical where neither of them are nan
+        isnan = jnp.isnan(lef) | jnp.isnan(rig)
+        _lef = cast(Array, jnp.where(isnan, 0, lef))
+        _rig = cast(Array, jnp.where(isnan, 0, rig))
+        return jnp.array_equal(_lef, _rig), jnp.where(jnp.isnan(rig), lef, rig)
+
+    left_leaves, treedef = jtu.tree_flatten(left)
+    right_leaves = treedef.flatten_up_to(right)
+    equal, merged = zip(*[_merge(l, r) for l, r in zip(left_leaves, right_leaves)])
+    # One host sync covering all leaves.
+    assert jnp.all(jnp.stack(equal))
+    return jtu.tree_unflatten(treedef, merged)
+
+
+def _interp_linear(ts, ys, **kwargs):
+    return diffrax.linear_interpolation(ts, ys, **kwargs)
+
+
+def _interp_linear2(ts, ys, **kwargs):
+    coeffs = diffrax.linear_interpolation(ts, ys, **kwargs)
+    return _evaluate_merged(diffrax.LinearInterpolation(ts, coeffs), ts)
+
+
+def _interp_cubic(ts, ys, **kwargs):
+    coeffs = diffrax.backward_hermite_coefficients(ts, ys, **kwargs)
+    return _evaluate_merged(diffrax.CubicInterpolation(ts, coeffs), ts)
+
+
+_interp_modes = {
+    "linear": _interp_linear,
+    "linear2": _interp_linear2,
+    "cubic": _interp_cubic,
+}
+
+
 @pytest.mark.parametrize("mode", ["linear", "linear2", "cubic"])
 @pytest.mark.parametrize("unsqueeze", [True, False])
 def test_interpolation_coeffs(mode, unsqueeze):
@@ -22,70 +83,41 @@ def test_interpolation_coeffs(mode, unsqueeze):
     nan_ys = ys.at[jnp.array([0, 3, 4, 6, 9])].set(jnp.nan)
     if unsqueeze:
         nan_ys = nan_ys[:, None]
-
-    def _interp(tree, duplicate, **kwargs):
-        if duplicate:
-            to_interp = jnp.repeat(nan_ys, 2, axis=-1)
+        nan_ys_dup = jnp.repeat(nan_ys, 2, axis=-1)
+
+    # Every variant of the data -- with a single channel and (when there is a channel
+    # axis) with duplicated channels -- is checked in one call, as the leaves of a
+    # single pytree.
+    nan_ys_variants = (nan_ys, nan_ys_dup) if unsqueeze else (nan_ys,)
+
+    def _variants(true_ys):
+        # The truths are built without a channel axis; this is the only place one is
+        # added, to match the layout of `nan_ys_variants`.
+        if unsqueeze:
+            true_ys = true_ys[:, None]
+            return true_ys, jnp.broadcast_to(true_ys, nan_ys_dup.shape)
         else:
-            to_interp = nan_ys
-        if tree:
-            to_interp = (to_interp,)
-        if mode == "linear":
-            return diffrax.linear_interpolation(ts, to_interp, **kwargs)
-
-        if mode == "linear2":
-            coeffs = diffrax.linear_interpolation(ts, to_interp, **kwargs)
-            interp = diffrax.LinearInterpolation(ts, coeffs)
-        elif mode == "cubic":
-            coeffs = diffrax.backward_hermite_coefficients(ts, to_interp, **kwargs)
-            interp = diffrax.CubicInterpolation(ts, coeffs)
-        else:
-            raise ValueError
-
-        left = jax.vmap(interp.evaluate)(ts)
-        right = jax.vmap(ft.partial(interp.evaluate, left=False))(ts)
+            return (true_ys,)
 
-        def _merge(lef, rig):
-            # Must be identical where neither of them are nan
-            isnan = jnp.isnan(lef) | jnp.isnan(rig)
-            _lef = cast(Array, jnp.where(isnan, 0, lef))
-            _rig = cast(Array, jnp.where(isnan, 0, rig))
-            assert jnp.array_equal(_lef, _rig)
-            return jnp.where(jnp.isnan(rig), lef, rig)
+    _interp = ft.partial(_interp_modes[mode], ts)
 
-        return jtu.tree_map(_merge, left, right)
-
-    interp_ys = _interp(tree=False, duplicate=False)
-    true_ys = ys.at[jnp.array([0, 9])].set(jnp.nan)
-    if unsqueeze:
-        true_ys = true_ys[:, None]
-    assert tree_allclose(interp_ys, true_ys, equal_nan=True)
-    if unsqueeze:
-        interp_ys = _interp(tree=False, duplicate=True)
-        assert tree_allclose(interp_ys, jnp.repeat(true_ys, 2, axis=-1), equal_nan=True)
-    (interp_ys,) = _interp(tree=True, duplicate=False)
+    interp_ys = _interp(nan_ys)
+    true_ys = _variants(ys.at[jnp.array([0, 9])].set(jnp.nan))
+    assert tree_allclose(interp_ys, true_ys[0], equal_nan=True)
+    interp_ys = _interp(nan_ys_variants)
     assert tree_allclose(interp_ys, true_ys, equal_nan=True)
 
-    interp_ys = _interp(tree=False, duplicate=False, fill_forward_nans_at_end=True)
-    true_ys = ys.at[0].set(jnp.nan).at[9].set(8.0)
-    if unsqueeze:
-        true_ys = true_ys[:, None]
-    assert tree_allclose(interp_ys, true_ys, equal_nan=True)
-    if unsqueeze:
-        interp_ys = _interp(tree=False, duplicate=True, fill_forward_nans_at_end=True)
-        assert tree_allclose(interp_ys, jnp.repeat(true_ys, 2, axis=-1), equal_nan=True)
-    (interp_ys,) = _interp(tree=True, duplicate=False, fill_forward_nans_at_end=True)
+    interp_ys = _interp(nan_ys, fill_forward_nans_at_end=True)
+    true_ys = _variants(ys.at[0].set(jnp.nan).at[9].set(8.0))
+    assert tree_allclose(interp_ys, true_ys[0], equal_nan=True)
+    interp_ys = _interp(nan_ys_variants, fill_forward_nans_at_end=True)
     assert tree_allclose(interp_ys, true_ys, equal_nan=True)
 
-    interp_ys = _interp(tree=False, duplicate=False, replace_nans_at_start=5.5)
-    true_ys = ys.at[0].set(5.5).at[9].set(jnp.nan)
-    if unsqueeze:
-        true_ys = true_ys[:, None]
-    assert tree_allclose(interp_ys, true_ys, equal_nan=True)
-    if unsqueeze:
-        interp_ys = _interp(tree=False, duplicate=True, replace_nans_at_start=5.5)
-        assert tree_allclose(interp_ys, jnp.repeat(true_ys, 2, axis=-1), equal_nan=True)
-    (interp_ys,) = _interp(tree=True, duplicate=False, replace_nans_at_start=(5.5,))
+    interp_ys = _interp(nan_ys, replace_nans_at_start=5.5)
+    true_ys = _variants(ys.at[0].set(5.5).at[9].set(jnp.nan))
+    assert tree_allclose(interp_ys, true_ys[0], equal_nan=True)
+    replace = (5.5,) * len(nan_ys_variants)
+    interp_ys = _interp(nan_ys_variants, replace_nans_at_start=replace)
     assert tree_allclose(interp_ys, true_ys, equal_nan=True)
 
 
@@ -129,29 +161,8 @@ def test_rectilinear_interpolation_coeffs():
     interp_ts, interp_ys = diffrax.rectilinear_interpolation(
         ts, ys, replace_nans_at_start=5.5
     )
-    true_ys = jnp.array(
-        [
-            5.5,
-            5.5,
-            0.2,
-            0.2,
-            0.1,
-            0.1,
-            0.1,
-            0.1,
-            0.1,
-            0.1,
-            0.5,
-            0.5,
-            0.5,
-            0.5,
-            0.8,
-            0.8,
-            0.1,
-            0.1,
-            0.1,
-        ]
-    )
+    # Only the leading nans are replaced.
+    true_ys = true_ys.at[:2].set(5.5)
     assert tree_allclose(interp_ts, true_ts)
     assert tree_allclose(interp_ys, true_ys, equal_nan=True)
     interp_ts, (interp_ys,) = diffrax.rectilinear_interpolation(
@@ -161,6 +172,24 @@ def test_rectilinear_interpolation_coeffs():
     assert tree_allclose(interp_ys, true_ys, equal_nan=True)
 
 
+# The exact cubic pieces expected in the tests below, written in Horner form so that
+# they act elementwise on `points`.
+def _cubic_ys(p):
+    return ((1.5 * p - 3) * p + 0.8) * p + 0.5
+
+
+def _cubic_derivs(p):
+    return (4.5 * p - 6) * p + 0.8
+
+
+def _cubic_deriv0_ys(p):
+    return ((-1.6 * p - 0.8) * p + 0.8) * p + 0.5
+
+
+def _cubic_deriv0_derivs(p):
+    return (-4.8 * p - 1.6) * p + 0.8
+
+
 @pytest.mark.parametrize("unsqueeze", [True, False])
 def test_cubic_interpolation_no_deriv0(unsqueeze):
     ts = jnp.array([-0.5, 0, 1.0])
@@ -174,13 +203,13 @@ def test_cubic_interpolation_no_deriv0(unsqueeze):
 
     points = jnp.linspace(-0.5, 0, 10)
 
-    interp_ys = jax.vmap(interp.evaluate)(points)
+    interp_ys = _vmap_evaluate(interp, points)
     true_ys = 0.1 + 0.4 * jnp.linspace(0, 1, 10)
     if unsqueeze:
         true_ys = true_ys[:, None]
     assert tree_allclose(interp_ys, true_ys)
 
-    derivs = jax.vmap(interp.derivative)(points)
+    derivs = _vmap_derivative(interp, points)
     true_derivs = jnp.broadcast_to(0.8, true_ys.shape)
     assert tree_allclose(derivs, true_derivs)
 
@@ -188,14 +217,14 @@ def test_cubic_interpolation_no_deriv0(unsqueeze):
 
     points = jnp.linspace(0, 1.0, 10)
 
-    interp_ys = jax.vmap(interp.evaluate)(points)
-    true_ys = jax.vmap(lambda p: jnp.polyval(jnp.array([1.5, -3, 0.8, 0.5]), p))(points)
+    interp_ys = _vmap_evaluate(interp, points)
+    true_ys = _cubic_ys(points)
     if unsqueeze:
         true_ys = true_ys[:, None]
     assert tree_allclose(interp_ys, true_ys)
 
-    derivs = jax.vmap(interp.derivative)(points)
-    true_derivs = jax.vmap(lambda p: jnp.polyval(jnp.array([4.5, -6, 0.8]), p))(points)
+    derivs = _vmap_derivative(interp, points)
+    true_derivs = _cubic_derivs(points)
     if unsqueeze:
         true_derivs = true_derivs[:, None]
     assert tree_allclose(derivs, true_derivs)
@@ -216,18 +245,14 @@ def test_cubic_interpolation_deriv0(unsqueeze):
 
     points = jnp.linspace(-0.5, 0, 10)
 
-    interp_ys = jax.vmap(interp.evaluate)(points)
-    true_ys = jax.vmap(lambda p: jnp.polyval(jnp.array([-1.6, -0.8, 0.8, 0.5]), p))(
-        points
-    )
+    interp_ys = _vmap_evaluate(interp, points)
+    true_ys = _cubic_deriv0_ys(points)
     if unsqueeze:
         true_ys = true_ys[:, None]
     assert tree_allclose(interp_ys, true_ys)
 
-    derivs = jax.vmap(interp.derivative)(points)
-    true_derivs = jax.vmap(lambda p: jnp.polyval(jnp.array([-4.8, -1.6, 0.8]), p))(
-        points
-    )
+    derivs = _vmap_derivative(interp, points)
+    true_derivs = _cubic_deriv0_derivs(points)
     if unsqueeze:
         true_derivs = true_derivs[:, None]
     assert tree_allclose(derivs, true_derivs)
@@ -236,19 +261,32 @@ def test_cubic_interpolation_deriv0(unsqueeze):
 
     points = jnp.linspace(0, 1.0, 10)
 
-    interp_ys = jax.vmap(interp.evaluate)(points)
-    true_ys = jax.vmap(lambda p: jnp.polyval(jnp.array([1.5, -3, 0.8, 0.5]), p))(points)
+    interp_ys = _vmap_evaluate(interp, points)
+    true_ys = _cubic_ys(points)
     if unsqueeze:
         true_ys = true_ys[:, None]
     assert tree_allclose(interp_ys, true_ys)
 
-    derivs = jax.vmap(interp.derivative)(points)
-    true_derivs = jax.vmap(lambda p: jnp.polyval(jnp.array([4.5, -6, 0.8]), p))(points)
+    derivs = _vmap_derivative(interp, points)
+    true_derivs = _cubic_derivs(points)
     if unsqueeze:
         true_derivs = true_derivs[:, None]
     assert tree_allclose(derivs, true_derivs)
 
 
+@eqx.filter_jit
+def _evaluate_segments(interp, points):
+    # `points` has shape `(segments, 10)`, with `points[:, 0]` being the start of each
+    # segment. Evaluate everything in one go, rather than looping over segments.
+    evaluate_right = ft.partial(interp.evaluate, left=False)
+    derivative_right = ft.partial(interp.derivative, left=False)
+    firstvals = jax.vmap(evaluate_right)(points[:, 0])
+    vals = jax.vmap(jax.vmap(interp.evaluate))(points[:, 1:])
+    firstderivs = jax.vmap(derivative_right)(points[:, 0])
+    derivs = jax.vmap(jax.vmap(interp.derivative))(points[:, 1:])
+    return firstvals, vals, firstderivs, derivs
+
+
 @pytest.mark.parametrize("mode", ["linear", "cubic"])
 @pytest.mark.parametrize("dtype", [jnp.float64, jnp.complex128])
 def test_interpolation_classes(mode, dtype, getkey):
@@ -273,38 +311,42 @@ def test_interpolation_classes(mode, dtype, getkey):
 
             assert jnp.array_equal(interp.t0, ts[0])
             assert jnp.array_equal(interp.t1, ts[-1])
-            pred_ys = jax.vmap(interp.evaluate)(ts)
+            pred_ys = _vmap_evaluate(interp, ts)
             assert tree_allclose(pred_ys, ys)
 
             if mode == "linear":
-                for i, (t0, t1) in enumerate(zip(ts[:-1], ts[1:])):
-                    if t0 == t1:
-                        continue
-                    y0 = jtu.tree_map(operator.itemgetter(i), ys)
-                    y1 = jtu.tree_map(operator.itemgetter(i + 1), ys)
-                    points = jnp.linspace(t0, t1, 10)
-                    firstval = interp.evaluate(t0, left=False)
-                    vals = jax.vmap(interp.evaluate)(points[1:])
-
-                    def _test(firstval, vals, y0, y1):
-                        vals = jnp.concatenate([firstval[None], vals])
-                        with jax.numpy_rank_promotion("allow"):
-                            true_vals = y0 + ((points - t0) / (t1 - t0)).astype(
-                                y0.dtype
-                            )[:, None] * (y1 - y0)
-                        assert tree_allclose(vals, true_vals)
-
-                    jtu.tree_map(_test, firstval, vals, y0, y1)
-                    firstderiv = interp.derivative(t0, left=False)
-                    derivs = jax.vmap(interp.derivative)(points[1:])
-
-                    def _test2(firstderiv, derivs, y0, y1):
-                        derivs = jnp.concatenate([firstderiv[None], derivs])
-                        true_derivs = (y1 - y0) / (t1 - t0).astype(y0.dtype)
-                        true_derivs = jnp.broadcast_to(true_derivs, derivs.shape)
-                        assert tree_allclose(derivs, true_derivs)
-
-                    jtu.tree_map(_test2, firstderiv, derivs, y0, y1)
+                t0s = ts[:-1]
+                t1s = ts[1:]
+                y0s = jtu.tree_map(lambda y: y[:-1], ys)
+                y1s = jtu.tree_map(lambda y: y[1:], ys)
+                # Zero-length segments have nothing to test.
+                mask = t0s != t1s
+                points = jax.vmap(lambda a, b: jnp.linspace(a, b, 10))(t0s, t1s)
+                firstvals, vals, firstderivs, derivs = _evaluate_segments(
+                    interp, points
+                )
+
+                def _test(firstval, vals, firstderiv, derivs, y0, y1):
+                    # Shape `(segments, 1, channels)`: the exact derivative on each
+                    # segment, from which we also get the exact values.
+                    dts = (t1s - t0s).astype(y0.dtype)
+                    slopes = ((y1 - y0) / dts[:, None])[:, None]
+                    offsets = (points - t0s[:, None]).astype(y0.dtype)[:, :, None]
+                    vals = jnp.concatenate([firstval[:, None], vals], axis=1)
+                    true_vals = y0[:, None] + offsets * slopes
+                    assert tree_allclose(vals[mask], true_vals[mask])
+                    derivs = jnp.concatenate([firstderiv[:, None], derivs], axis=1)
+                    true_derivs = jnp.broadcast_to(slopes, derivs.shape)
+                    assert tree_allclose(derivs[mask], true_derivs[mask])
+
+                # Every leaf has the same shape, so check them all at once by stacking
+                # them along the channel axis.
+                leaves = [
+                    jtu.tree_leaves(x)
+                    for x in (firstvals, vals, firstderivs, derivs, y0s, y1s)
+                ]
+                if len(leaves[0]) > 0:
+                    _test(*[jnp.concatenate(x, axis=-1) for x in leaves])
 
 
 def _test_dense_interpolation(solver, key, t1):
@@ -330,10 +372,10 @@ def _test_dense_interpolation(solver, key, t1):
         saveat=diffrax.SaveAt(dense=True),
     )
     points = jnp.linspace(0, t1, int(1e4))  # finer resolution than the step size
-    vals = jax.vmap(sol.evaluate)(points)
+    vals = _vmap_evaluate(sol, points)
     true_vals = jnp.exp(-points) * y0
 
-    derivs = jax.vmap(sol.derivative)(points)
+    derivs = _vmap_derivative(sol, points)
     true_derivs = -true_vals
 
     return vals, true_vals, derivs, true_derivs
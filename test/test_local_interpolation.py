@@ -1,6 +1,8 @@
 import diffrax
 import jax
 import jax.numpy as jnp
+import jax.random as jr
+import jax.tree_util as jtu
 
 from .helpers import tree_allclose
 
@@ -58,3 +60,96 @@ def test_third_order_hermite():
         t0=t0, t1=t1, y0=y0, y1=y1, k0=k0, k1=k1
     )
     assert tree_allclose(interp.evaluate(2.6), y(2.6))
+
+
+def test_tsit5_interpolation(getkey):
+    t0 = 2.0
+    t1 = 3.3
+    t0_ = 2.8
+    t1_ = 2.9
+    interpolation_cls = diffrax.Tsit5().interpolation_cls
+    y0s = (
+        jnp.array([2.1, 3.1]),
+        {"a": jnp.array([2.1, 3.1]), "b": [jnp.array(0.4)]},
+    )
+    for y0 in y0s:
+        k = jtu.tree_map(lambda y: jr.normal(getkey(), (7,) + y.shape), y0)
+        interp = interpolation_cls(t0=t0, t1=t1, y0=y0, y1=y0, k=k)
+
+        # evaluate increment
+        pred = interp.evaluate(t0_, t1_)
+        true = jtu.tree_map(
+            lambda a, b: b - a, interp.evaluate(t0_), interp.evaluate(t1_)
+        )
+        assert tree_allclose(pred, true)
+
+        # evaluate over zero-length interval. Note t1=t0.
+        interp = interpolation_cls(t0=t0, t1=t0, y0=y0, y1=y0, k=k)
+        pred = interp.evaluate(t0)
+        assert tree_allclose(pred, y0)
+
+        _, pred = jax.jvp(interp.evaluate, (t0,), (jnp.ones_like(t0),))
+        assert tree_allclose(pred, jtu.tree_map(jnp.zeros_like, pred))
+
+        pred = interp.evaluate(t0, t0)
+        assert tree_allclose(pred, jtu.tree_map(jnp.zeros_like, y0))
+
+
+def test_fourth_order_polynomial_float32(getkey):
+    # The float64 NumPy coefficients must not promote float32 stages.
+    t0 = 2.0
+    t1 = 3.3
+    y0 = jnp.array([2.1, 3.1], dtype=jnp.float32)
+    y1 = jnp.array([2.2, 3.0], dtype=jnp.float32)
+    k = jr.normal(getkey(), (7, 2), dtype=jnp.float32)
+    interpolation_cls = diffrax.Dopri5().interpolation_cls
+    interp = interpolation_cls(t0=t0, t1=t1, y0=y0, y1=y1, k=k)
+    interp64 = interpolation_cls(
+        t0=t0,
+        t1=t1,
+        y0=y0.astype(jnp.float64),
+        y1=y1.astype(jnp.float64),
+        k=k.astype(jnp.float64),
+    )
+
+    pred = interp.evaluate(2.8)
+    assert pred.dtype == jnp.float32
+    assert tree_allclose(pred, interp64.evaluate(2.8).astype(jnp.float32))
+    assert tree_allclose(interp.evaluate(t1), y1)
+
+
+def test_tsit5_interpolation_polynomials(getkey):
+    # The factored forms of b1, ..., b7 from Tsitouras' paper.
+    def _weights(t):
+        return jnp.stack(
+            [
+                -1.0530884977290216
+                * t
+                * (t - 1.3299890189751412)
+                * (t**2 - 1.4364028541716351 * t + 0.7139816917074209),
+                0.1017 * t**2 * (t**2 - 2.1966568338249754 * t + 1.2949852507374631),
+                2.490627285651252793
+                * t**2
+                * (t**2 - 2.38535645472061657 * t + 1.57803468208092486),
+                -16.54810288924490272
+                * (t - 1.21712927295533244)
+                * (t - 0.61620406037800089)
+                * t**2,
+                47.37952196281928122
+                * (t - 1.203071208372362603)
+                * (t - 0.658047292653547382)
+                * t**2,
+                -34.87065786149660974 * (t - 1.2) * (t - 0.666666666666666667) * t**2,
+                2.5 * (t - 1) * (t - 0.6) * t**2,
+            ]
+        )
+
+    t0 = 2.0
+    t1 = 3.3
+    y0 = jnp.array([2.1, 3.1])
+    k = jr.normal(getkey(), (7, 2))
+    interp = diffrax.Tsit5().interpolation_cls(t0=t0, t1=t1, y0=y0, y1=y0, k=k)
+    for t in (2.0, 2.3, 2.8, 3.3):
+        pred = interp.evaluate(t)
+        true = y0 + _weights(jnp.array((t - t0) / (t1 - t0))) @ k
+        assert tree_allclose(pred, true)